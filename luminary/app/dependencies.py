@@ -1,6 +1,7 @@
 import httpx
 from fastapi import Request
 
+from app.services.ref_cache import RefCache
 from app.services.store import EnvironmentStore
 
 
@@ -10,3 +11,11 @@ def get_store(request: Request) -> EnvironmentStore:
 
 def get_http_client(request: Request) -> httpx.AsyncClient:
     return request.app.state.http_client
+
+
+def get_insecure_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client_insecure
+
+
+def get_ref_cache(request: Request) -> RefCache:
+    return request.app.state.ref_cache
@@ -1,46 +1,78 @@
 import os
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 import httpx
+import orjson
 from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 import app.config as _config
 from app.routers import environments, proxy, spec
+from app.services.ref_cache import RefCache
 from app.services.store import EnvironmentStore
 
 STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+INDEX_PATH = os.path.join(STATIC_DIR, "index.html")
 
+# Constant bodies for the polled endpoints, served without any encoding.
+_HEALTH_JSON = b'{"status":"ok"}'
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    app.state.store = EnvironmentStore(_config.DATA_DIR / "environments.json")
-    await app.state.store.load()
-    app.state.http_client = httpx.AsyncClient(timeout=60.0)
-    yield
-    await app.state.http_client.aclose()
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=512, max_keepalive_connections=256, keepalive_expiry=30.0
+)
 
 
-app = FastAPI(title="Luminary", version="0.2.0", lifespan=lifespan)
+def _build_http_client(verify: bool = True) -> httpx.AsyncClient:
+    # Configure the pool on the client rather than via transport=, which would
+    # turn off HTTP(S)_PROXY / NO_PROXY handling from the environment.
+    return httpx.AsyncClient(
+        verify=verify, http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+    )
 
-app.include_router(environments.router)
-app.include_router(spec.router)
-app.include_router(proxy.router)
 
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+def create_app(data_dir: Path | None = None) -> FastAPI:
+    """Build the app; the store lives in data_dir, or DATA_DIR at startup."""
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        store_dir = data_dir if data_dir is not None else _config.DATA_DIR
+        app.state.store = EnvironmentStore(store_dir / "environments.json")
+        await app.state.store.load()
+        app.state.http_client = _build_http_client()
+        app.state.http_client_insecure = _build_http_client(verify=False)
+        app.state.ref_cache = RefCache()
+        yield
+        await app.state.store.aclose()
+        await app.state.http_client.aclose()
+        await app.state.http_client_insecure.aclose()
 
-@app.get("/", include_in_schema=False)
-def root():
-    return FileResponse(os.path.join(STATIC_DIR, "index.html"))
+    app = FastAPI(title="Luminary", version="0.2.0", lifespan=lifespan)
 
+    app.include_router(environments.router)
+    app.include_router(spec.router)
+    app.include_router(proxy.router)
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
+    @app.get("/", include_in_schema=False)
+    def root():
+        return FileResponse(INDEX_PATH)
 
-@app.get("/api/info")
-def info():
-    return {"message": "Hello World", "version": "0.2.0"}
+    info_json = orjson.dumps({"message": "Hello World", "version": app.version})
+
+    # async so these don't take a threadpool hop for a constant response.
+    @app.get("/health")
+    async def health():
+        return Response(content=_HEALTH_JSON, media_type="application/json")
+
+    @app.get("/api/info")
+    async def info():
+        return Response(content=info_json, media_type="application/json")
+
+    return app
+
+
+app = create_app()
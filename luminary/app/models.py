@@ -24,6 +24,8 @@ class AuthConfigPublic(BaseModel):
     has_token: bool
     has_password: bool
 
+    model_config = {"frozen": True}
+
 
 # ─── Environment ─────────────────────────────────────────────────────────────
 
@@ -60,16 +62,19 @@ class EnvironmentPublic(BaseModel):
     updated_at: datetime
     auth: AuthConfigPublic
 
+    model_config = {"frozen": True}
+
     @classmethod
     def from_env(cls, env: Environment) -> "EnvironmentPublic":
-        return cls(
+        # The stored Environment is already validated; skip revalidation.
+        return cls.model_construct(
             id=env.id,
             name=env.name,
             base_url=env.base_url,
             verify_ssl=env.verify_ssl,
             created_at=env.created_at,
             updated_at=env.updated_at,
-            auth=AuthConfigPublic(
+            auth=AuthConfigPublic.model_construct(
                 type=env.auth.type,
                 header_name=env.auth.header_name,
                 bearer_prefix=env.auth.bearer_prefix,
@@ -132,6 +137,7 @@ class ProxyRequest(BaseModel):
     headers: dict[str, str] = {}
     body: Any | None = None
     timeout: float = 30.0
+    stream: bool = False
 
 
 class ProxyResponse(BaseModel):
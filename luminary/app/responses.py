@@ -0,0 +1,23 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Handlers on hot paths return this directly so FastAPI skips the
+    response_model re-validation and jsonable_encoder walk.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # orjson rejects integers outside the 64-bit range, which proxied
+            # upstream bodies may legitimately contain.
+            return super().render(content)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.dependencies import get_store
 from app.models import EnvironmentCreate, EnvironmentPublic, EnvironmentUpdate
@@ -9,8 +9,7 @@ router = APIRouter(prefix="/api/environments", tags=["environments"])
 
 @router.get("", response_model=list[EnvironmentPublic])
 async def list_environments(store: EnvironmentStore = Depends(get_store)):
-    envs = await store.get_all()
-    return [EnvironmentPublic.from_env(e) for e in envs]
+    return Response(content=await store.list_bytes(), media_type="application/json")
 
 
 @router.post("", response_model=EnvironmentPublic, status_code=201)
@@ -1,12 +1,14 @@
 import httpx
 from fastapi import APIRouter, Depends, HTTPException
 
-from app.dependencies import get_http_client, get_store
+from app.dependencies import get_http_client, get_insecure_http_client, get_store
 from app.models import ProxyRequest, ProxyResponse
+from app.responses import ORJSONResponse
 from app.services.proxy_service import (
     ProxyConnectionError,
     ProxyTimeoutError,
     execute_proxy,
+    stream_proxy,
 )
 from app.services.store import EnvironmentStore
 
@@ -18,16 +20,20 @@ async def proxy_execute(
     body: ProxyRequest,
     store: EnvironmentStore = Depends(get_store),
     http_client: httpx.AsyncClient = Depends(get_http_client),
+    insecure_http_client: httpx.AsyncClient = Depends(get_insecure_http_client),
 ):
     env = await store.get(body.environment_id)
     if env is None:
         raise HTTPException(status_code=404, detail="Environment not found")
 
+    client = http_client if env.verify_ssl else insecure_http_client
     try:
-        result = await execute_proxy(body, env, http_client)
+        if body.stream:
+            return await stream_proxy(body, env, client)
+        result = await execute_proxy(body, env, client)
     except ProxyTimeoutError as exc:
         raise HTTPException(status_code=504, detail=f"Upstream timeout: {exc}")
     except ProxyConnectionError as exc:
         raise HTTPException(status_code=502, detail=f"Upstream unreachable: {exc}")
 
-    return result
+    return ORJSONResponse(result.model_dump())
@@ -1,8 +1,9 @@
 import httpx
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from app.dependencies import get_http_client, get_store
+from app.dependencies import get_http_client, get_ref_cache, get_store
 from app.models import LoadedSpec, SpecLoadRequest
+from app.services.ref_cache import RefCache
 from app.services.spec_service import SpecFetchError, SpecParseError, load_spec
 from app.services.store import EnvironmentStore
 
@@ -14,6 +15,7 @@ async def load_spec_endpoint(
     body: SpecLoadRequest,
     store: EnvironmentStore = Depends(get_store),
     http_client: httpx.AsyncClient = Depends(get_http_client),
+    ref_cache: RefCache = Depends(get_ref_cache),
 ):
     environment = None
     if body.environment_id:
@@ -22,24 +24,24 @@ async def load_spec_endpoint(
             raise HTTPException(status_code=404, detail="Environment not found")
 
     try:
-        loaded = await load_spec(body.url, http_client, environment)
+        loaded = await load_spec(body.url, http_client, environment, ref_cache)
     except SpecFetchError as exc:
         raise HTTPException(status_code=502, detail=str(exc))
     except SpecParseError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
 
-    store.spec = loaded
-    return loaded
+    await store.set_spec(loaded)
+    return Response(content=store.spec_json, media_type="application/json")
 
 
 @router.get("")
 async def get_spec(store: EnvironmentStore = Depends(get_store)):
-    if store.spec is None:
+    if store.spec_json is None:
         return {"loaded": False}
-    return store.spec
+    return Response(content=store.spec_json, media_type="application/json")
 
 
 @router.delete("")
 async def clear_spec(store: EnvironmentStore = Depends(get_store)):
-    store.spec = None
+    await store.set_spec(None)
     return {"cleared": True}
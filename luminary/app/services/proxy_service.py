@@ -1,8 +1,12 @@
+import re
 import time
 import urllib.parse
+from collections.abc import AsyncIterator, Iterator
+from contextlib import AsyncExitStack, contextmanager
 from typing import Any
 
 import httpx
+from starlette.responses import StreamingResponse
 
 from app.models import Environment, ProxyRequest, ProxyResponse
 
@@ -19,6 +23,9 @@ HOP_BY_HOP = frozenset(
         "upgrade",
     ]
 )
+HOP_BY_HOP_BYTES = frozenset(h.encode() for h in HOP_BY_HOP)
+
+_PATH_PARAM_RE = re.compile(r"\{([^}]+)\}")
 
 
 class ProxyConnectionError(Exception):
@@ -30,9 +37,17 @@ class ProxyTimeoutError(Exception):
 
 
 def _substitute_path_params(path: str, path_params: dict[str, str]) -> str:
-    for key, value in path_params.items():
-        path = path.replace(f"{{{key}}}", urllib.parse.quote(str(value), safe=""))
-    return path
+    if not path_params:
+        return path
+
+    def _replace(match: re.Match[str]) -> str:
+        value = path_params.get(match.group(1))
+        if value is None:
+            # Leave placeholders without a supplied value untouched
+            return match.group(0)
+        return urllib.parse.quote(str(value), safe="")
+
+    return _PATH_PARAM_RE.sub(_replace, path)
 
 
 def _build_headers(req: ProxyRequest, env: Environment) -> dict[str, str]:
@@ -64,18 +79,34 @@ def _normalize_response_body(resp: httpx.Response) -> Any:
 
 
 def _filter_headers(headers: httpx.Headers) -> dict[str, str]:
-    return {
-        k: v
-        for k, v in headers.items()
-        if k.lower() not in HOP_BY_HOP
-    }
+    # Work on the raw byte pairs so hop-by-hop headers are dropped before any
+    # decoding; repeated headers are comma-joined like Headers.items() does.
+    encoding = headers.encoding
+    filtered: dict[str, str] = {}
+    for raw_key, raw_value in headers.raw:
+        key = raw_key.lower()
+        if key in HOP_BY_HOP_BYTES:
+            continue
+        name = key.decode(encoding)
+        value = raw_value.decode(encoding)
+        if name in filtered:
+            filtered[name] += f", {value}"
+        else:
+            filtered[name] = value
+    return filtered
 
 
-async def execute_proxy(
-    req: ProxyRequest,
-    env: Environment,
-    http_client: httpx.AsyncClient,
-) -> ProxyResponse:
+@contextmanager
+def _upstream_errors() -> Iterator[None]:
+    try:
+        yield
+    except httpx.TimeoutException as exc:
+        raise ProxyTimeoutError(str(exc)) from exc
+    except httpx.HTTPError as exc:
+        raise ProxyConnectionError(str(exc)) from exc
+
+
+def _prepare_request(req: ProxyRequest, env: Environment) -> tuple[str, dict[str, Any]]:
     path = _substitute_path_params(req.path, req.path_params)
     url = env.base_url.rstrip("/") + path
     headers = _build_headers(req, env)
@@ -93,21 +124,19 @@ async def execute_proxy(
     if req.body is not None:
         kwargs["json"] = req.body
 
+    return url, kwargs
+
+
+async def execute_proxy(
+    req: ProxyRequest,
+    env: Environment,
+    http_client: httpx.AsyncClient,
+) -> ProxyResponse:
+    url, kwargs = _prepare_request(req, env)
+
     start = time.monotonic()
-    try:
-        # For verify_ssl=False environments, create a temporary client.
-        # The shared http_client is used for verified connections.
-        if not env.verify_ssl:
-            async with httpx.AsyncClient(verify=False) as tmp_client:
-                resp = await tmp_client.request(req.method.upper(), url, **kwargs)
-        else:
-            resp = await http_client.request(req.method.upper(), url, **kwargs)
-    except httpx.TimeoutException as exc:
-        raise ProxyTimeoutError(str(exc)) from exc
-    except httpx.ConnectError as exc:
-        raise ProxyConnectionError(str(exc)) from exc
-    except httpx.HTTPError as exc:
-        raise ProxyConnectionError(str(exc)) from exc
+    with _upstream_errors():
+        resp = await http_client.request(req.method.upper(), url, **kwargs)
 
     duration_ms = (time.monotonic() - start) * 1000
     body = _normalize_response_body(resp)
@@ -120,3 +149,43 @@ async def execute_proxy(
         duration_ms=round(duration_ms, 2),
         url=str(resp.url),
     )
+
+
+async def _relay_body(
+    resp: httpx.Response, cleanup: AsyncExitStack
+) -> AsyncIterator[bytes]:
+    # Release the upstream connection however the relay ends, including a
+    # failed upstream read or a client disconnect, where Starlette never runs
+    # a response's background task.
+    try:
+        async for chunk in resp.aiter_raw():
+            yield chunk
+    finally:
+        await cleanup.aclose()
+
+
+async def stream_proxy(
+    req: ProxyRequest,
+    env: Environment,
+    http_client: httpx.AsyncClient,
+) -> StreamingResponse:
+    """
+    Relay the upstream response as-is instead of wrapping it in a ProxyResponse.
+    The body is passed through undecoded in chunks, so memory stays bounded
+    regardless of payload size.
+    """
+    url, kwargs = _prepare_request(req, env)
+
+    async with AsyncExitStack() as stack:
+        with _upstream_errors():
+            resp = await stack.enter_async_context(
+                http_client.stream(req.method.upper(), url, **kwargs)
+            )
+        # Keep the upstream connection open until the body has been relayed.
+        cleanup = stack.pop_all()
+
+    return StreamingResponse(
+        _relay_body(resp, cleanup),
+        status_code=resp.status_code,
+        headers=_filter_headers(resp.headers),
+    )
@@ -0,0 +1,31 @@
+from collections import OrderedDict
+
+
+class RefCache:
+    """
+    LRU of parsed external $ref documents keyed by URL, kept across spec loads
+    together with the ETag they were served with, so reloads can revalidate
+    with a conditional GET instead of downloading and parsing again.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[str, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url: str) -> tuple[str, dict] | None:
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def put(self, url: str, etag: str, doc: dict) -> None:
+        self._entries[url] = (etag, doc)
+        self._entries.move_to_end(url)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,10 +1,14 @@
 import asyncio
 import json
+import re
+from collections.abc import Iterator
 from datetime import datetime, timezone
+from typing import Any
 from urllib.parse import urljoin
 
 import httpx
 import yaml
+from pydantic_core import from_json
 
 from app.models import (
     EndpointSummary,
@@ -12,55 +16,115 @@ from app.models import (
     LoadedSpec,
     ParameterInfo,
 )
+from app.services.ref_cache import RefCache
 
 HTTP_METHODS = frozenset(
     ["get", "post", "put", "patch", "delete", "head", "options", "trace"]
 )
 
+# Upper bound on concurrent external $ref downloads per spec load.
+EXTERNAL_FETCH_CONCURRENCY = 30
+
+# libyaml's C loader is several times faster than the pure-Python one on
+# large specs; fall back when PyYAML was built without it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_JSON_START = re.compile(rb"\s*[{\[]")
+
+
+def _loads_json(content: bytes) -> Any:
+    # pydantic-core's parser keeps integers wider than 64 bits exact (orjson
+    # would silently turn them into floats) and is still well ahead of the
+    # stdlib on large documents.
+    try:
+        return from_json(content)
+    except ValueError:
+        # The stdlib also tolerates a UTF-8 BOM.
+        return json.loads(content)
+
+
+def _parse_document(content: bytes, is_yaml: bool) -> Any:
+    # JSON is a subset of YAML but far cheaper to parse, so JSON-looking
+    # documents skip the YAML parser even when served as YAML. Both parsers
+    # read the body bytes directly; no decoded str copy is ever built.
+    if _JSON_START.match(content):
+        try:
+            return _loads_json(content)
+        except ValueError:
+            if not is_yaml:
+                raise
+    if is_yaml:
+        return yaml.load(content, Loader=_YAML_LOADER)
+    return _loads_json(content)
+
 
 # ─── External $ref fetching ───────────────────────────────────────────────────
 
 async def _fetch_external(
     url: str,
     http_client: httpx.AsyncClient,
-    sem: asyncio.Semaphore,
     cache: dict[str, dict],
+    ref_cache: RefCache | None = None,
 ) -> dict:
     if url in cache:
         return cache[url]
-    async with sem:
-        try:
-            resp = await http_client.get(url, follow_redirects=True, timeout=30.0)
-            resp.raise_for_status()
-        except Exception:
-            cache[url] = {}
-            return {}
-        is_yaml = (
-            "yaml" in resp.headers.get("content-type", "")
-            or url.endswith(".yaml")
-            or url.endswith(".yml")
+    cached = ref_cache.get(url) if ref_cache is not None else None
+    headers = {"If-None-Match": cached[0]} if cached is not None else None
+    try:
+        resp = await http_client.get(
+            url, headers=headers, follow_redirects=True, timeout=30.0
         )
-        try:
-            parsed = yaml.safe_load(resp.text) if is_yaml else json.loads(resp.text)
-            result = parsed if isinstance(parsed, dict) else {}
-        except Exception:
-            result = {}
-        cache[url] = result
-        return result
+        if cached is not None and resp.status_code == 304:
+            cache[url] = cached[1]
+            return cached[1]
+        resp.raise_for_status()
+    except Exception:
+        cache[url] = {}
+        return {}
+    is_yaml = (
+        "yaml" in resp.headers.get("content-type", "")
+        or url.endswith(".yaml")
+        or url.endswith(".yml")
+    )
+    try:
+        parsed = _parse_document(resp.content, is_yaml)
+        result = parsed if isinstance(parsed, dict) else {}
+    except Exception:
+        result = {}
+    cache[url] = result
+    etag = resp.headers.get("etag")
+    if ref_cache is not None and etag and result:
+        ref_cache.put(url, etag, result)
+    return result
+
+
+def _external_param_refs(doc: dict, file_url: str) -> Iterator[str]:
+    """Yield absolute URLs of a path-item document's external parameter $refs."""
+    file_base = file_url.rsplit("/", 1)[0] + "/"
+    for method in HTTP_METHODS:
+        op = doc.get(method)
+        if not isinstance(op, dict):
+            continue
+        for param in op.get("parameters", []):
+            if isinstance(param, dict) and "$ref" in param:
+                ref = param["$ref"]
+                if not ref.startswith("#"):
+                    yield urljoin(file_base, ref)
 
 
 async def _resolve_external_path_items(
     spec: dict,
     spec_url: str,
     http_client: httpx.AsyncClient,
+    ref_cache: RefCache | None = None,
 ) -> None:
     """
-    Fetch external path-item $refs concurrently, then inline their parameter $refs.
-    Mutates spec["paths"] in-place.
+    Fetch external path-item $refs and their parameter $refs concurrently, then
+    inline them. Mutates spec["paths"] in-place; fetched documents are left
+    untouched so they can be reused from ref_cache by later loads.
     """
     paths = spec.get("paths", {})
     cache: dict[str, dict] = {}
-    sem = asyncio.Semaphore(30)
 
     # Base dir of the spec file (for resolving relative refs)
     spec_base = spec_url.rsplit("/", 1)[0] + "/"
@@ -78,42 +142,54 @@ async def _resolve_external_path_items(
     if not external:
         return
 
-    # Phase 2: fetch all path-item files concurrently
-    items: dict[str, tuple[dict, str]] = {}  # path → (doc, file_url)
-
-    async def _fetch_path_item(path: str, url: str) -> None:
-        doc = await _fetch_external(url, http_client, sem, cache)
-        items[path] = (doc, url)
-
-    await asyncio.gather(*[_fetch_path_item(p, u) for p, u in external.items()])
-
-    # Phase 3: collect all parameter $refs (relative to their path-item file)
-    param_urls: set[str] = set()
-    for _path, (doc, file_url) in items.items():
-        if not doc:
-            continue
-        file_base = file_url.rsplit("/", 1)[0] + "/"
-        for method in HTTP_METHODS:
-            op = doc.get(method)
-            if not isinstance(op, dict):
-                continue
-            for param in op.get("parameters", []):
-                if isinstance(param, dict) and "$ref" in param:
-                    ref = param["$ref"]
-                    if not ref.startswith("#"):
-                        param_urls.add(urljoin(file_base, ref))
-
-    # Phase 4: fetch all parameter files concurrently
-    if param_urls:
-        await asyncio.gather(
-            *[_fetch_external(u, http_client, sem, cache) for u in param_urls]
-        )
-
-    # Phase 5: inline path items, resolving their parameter refs
+    # Phase 2: fetch path items and parameter files through one work queue.
+    # A path item's parameter refs are queued as soon as it is parsed, so they
+    # download while other path items are still in flight.
+    path_item_urls = set(external.values())
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    queued: set[str] = set()
+
+    def _enqueue(url: str) -> None:
+        if url not in queued:
+            queued.add(url)
+            queue.put_nowait(url)
+
+    async def _worker() -> None:
+        while True:
+            url = await queue.get()
+            try:
+                doc = await _fetch_external(url, http_client, cache, ref_cache)
+                if url in path_item_urls:
+                    for param_url in _external_param_refs(doc, url):
+                        _enqueue(param_url)
+            finally:
+                queue.task_done()
+
+    for url in path_item_urls:
+        _enqueue(url)
+    # The worker count is the only concurrency bound; the client's connection
+    # pool is sized well above it.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            workers = [
+                tg.create_task(_worker()) for _ in range(EXTERNAL_FETCH_CONCURRENCY)
+            ]
+            await queue.join()
+            for worker in workers:
+                worker.cancel()
+    except ExceptionGroup as group:
+        # Raise the first failure as-is, like gather() did, so callers can
+        # still map SpecParseError and friends to their HTTP responses.
+        raise group.exceptions[0] from None
+
+    items = {path: (cache.get(url, {}), url) for path, url in external.items()}
+
+    # Phase 3: inline path items, resolving their parameter refs
     for path, (doc, file_url) in items.items():
         if not doc:
             continue
         file_base = file_url.rsplit("/", 1)[0] + "/"
+        inlined = dict(doc)
         for method in HTTP_METHODS:
             op = doc.get(method)
             if not isinstance(op, dict):
@@ -129,13 +205,46 @@ async def _resolve_external_path_items(
                         inlined_params.append(param)
                 else:
                     inlined_params.append(param)
-            op["parameters"] = inlined_params
-        paths[path] = doc
+            inlined[method] = {**op, "parameters": inlined_params}
+        paths[path] = inlined
 
 
 # ─── Internal $ref resolution (single-document) ──────────────────────────────
 
-def _resolve_internal_ref(ref: str, spec: dict) -> dict:
+# Containers whose direct children are the usual $ref targets: OpenAPI 3
+# components and their Swagger 2 top-level equivalents.
+_REF_SECTIONS = ("definitions", "parameters", "responses")
+
+
+def _pointer_escape(name: str) -> str:
+    return name.replace("~", "~0").replace("/", "~1")
+
+
+def _build_ref_index(spec: dict) -> dict[str, dict]:
+    """
+    Map "#/components/schemas/Foo"-style refs to their nodes in one pass, so
+    resolving a ref is a dict lookup instead of a walk from the spec root.
+    """
+    index: dict[str, dict] = {}
+    containers: list[tuple[str, object]] = [
+        (f"#/{section}", spec.get(section)) for section in _REF_SECTIONS
+    ]
+    components = spec.get("components")
+    if isinstance(components, dict):
+        containers.extend(
+            (f"#/components/{_pointer_escape(section)}", entries)
+            for section, entries in components.items()
+        )
+    for prefix, entries in containers:
+        if not isinstance(entries, dict):
+            continue
+        for name, node in entries.items():
+            if isinstance(node, dict):
+                index[f"{prefix}/{_pointer_escape(name)}"] = node
+    return index
+
+
+def _walk_ref(ref: str, spec: dict) -> dict:
     if not ref.startswith("#/"):
         return {}
     parts = ref.lstrip("#/").split("/")
@@ -147,16 +256,44 @@ def _resolve_internal_ref(ref: str, spec: dict) -> dict:
     return node if isinstance(node, dict) else {}
 
 
-def _resolve_schema(schema: dict, spec: dict) -> dict:
+def _resolve_internal_ref(ref: str, spec: dict, index: dict[str, dict]) -> dict:
+    node = index.get(ref)
+    if node is None:
+        # Refs outside the indexed containers are walked once and memoized.
+        node = index[ref] = _walk_ref(ref, spec)
+    return node
+
+
+def _resolve_schema(schema: dict, spec: dict, index: dict[str, dict]) -> dict:
     if "$ref" in schema:
-        return _resolve_internal_ref(schema["$ref"], spec)
+        return _resolve_internal_ref(schema["$ref"], spec, index)
     return schema
 
 
 # ─── Endpoint flattening ─────────────────────────────────────────────────────
 
+# The summaries below are built with model_construct, so values taken from the
+# (untrusted) document are coerced here instead of by pydantic validation.
+# These are the string spellings pydantic's lax bool accepts as true.
+_TRUE_STRINGS = frozenset({"1", "on", "t", "true", "y", "yes"})
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return value is True or (type(value) is int and value == 1)
+
+
+def _as_str(value: Any) -> str | None:
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _as_dict(value: Any) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
 def _extract_parameters(
-    operation: dict, path_item: dict, spec: dict
+    operation: dict, path_item: dict, spec: dict, index: dict[str, dict]
 ) -> list[ParameterInfo]:
     raw: list[dict] = list(path_item.get("parameters", []))
     raw.extend(operation.get("parameters", []))
@@ -165,30 +302,32 @@ def _extract_parameters(
         if not isinstance(p, dict):
             continue
         if "$ref" in p:
-            p = _resolve_internal_ref(p["$ref"], spec)
+            p = _resolve_internal_ref(p["$ref"], spec, index)
         if not p:
             continue
-        schema = _resolve_schema(p.get("schema", {}), spec)
+        schema = _resolve_schema(p.get("schema", {}), spec, index)
+        # model_construct skips validation: this runs for every parameter of
+        # every operation, so the document's values are coerced by hand.
         params.append(
-            ParameterInfo(
-                name=p.get("name", ""),
-                location=p.get("in", "query"),
-                required=p.get("required", False),
-                description=p.get("description"),
-                schema=schema,
+            ParameterInfo.model_construct(
+                name=str(p.get("name", "")),
+                location=str(p.get("in", "query")),
+                required=_as_bool(p.get("required", False)),
+                description=_as_str(p.get("description")),
+                schema=_as_dict(schema),
             )
         )
     return params
 
 
 def _extract_request_body(
-    operation: dict, spec: dict
+    operation: dict, spec: dict, index: dict[str, dict]
 ) -> tuple[bool, dict | None, bool]:
     rb = operation.get("requestBody")
     if rb is None:
         return False, None, False
     if "$ref" in rb:
-        rb = _resolve_internal_ref(rb["$ref"], spec)
+        rb = _resolve_internal_ref(rb["$ref"], spec, index)
     required = rb.get("required", False)
     content = rb.get("content", {})
     for media_type in (
@@ -198,14 +337,15 @@ def _extract_request_body(
     ):
         if media_type in content:
             schema = _resolve_schema(
-                content[media_type].get("schema", {}), spec
+                content[media_type].get("schema", {}), spec, index
             )
-            return True, schema, required
+            return True, _as_dict(schema), required
     return True, None, required
 
 
 def _flatten_endpoints(spec: dict) -> list[EndpointSummary]:
     paths = spec.get("paths", {})
+    index = _build_ref_index(spec)
     endpoints = []
     for path, path_item in paths.items():
         if not isinstance(path_item, dict):
@@ -215,22 +355,23 @@ def _flatten_endpoints(spec: dict) -> list[EndpointSummary]:
                 continue
             if not isinstance(operation, dict):
                 continue
-            parameters = _extract_parameters(operation, path_item, spec)
+            parameters = _extract_parameters(operation, path_item, spec, index)
             has_body, body_schema, body_required = _extract_request_body(
-                operation, spec
+                operation, spec, index
             )
+            tags = operation.get("tags", [])
             endpoints.append(
-                EndpointSummary(
+                EndpointSummary.model_construct(
                     method=method.upper(),
                     path=path,
-                    operation_id=operation.get("operationId"),
-                    summary=operation.get("summary"),
-                    description=operation.get("description"),
-                    tags=operation.get("tags", []),
+                    operation_id=_as_str(operation.get("operationId")),
+                    summary=_as_str(operation.get("summary")),
+                    description=_as_str(operation.get("description")),
+                    tags=[str(t) for t in tags] if isinstance(tags, list) else [],
                     parameters=parameters,
                     has_request_body=has_body,
                     request_body_schema=body_schema,
-                    request_body_required=body_required,
+                    request_body_required=_as_bool(body_required),
                 )
             )
     return endpoints
@@ -242,6 +383,7 @@ async def load_spec(
     url: str,
     http_client: httpx.AsyncClient,
     environment: Environment | None = None,
+    ref_cache: RefCache | None = None,
 ) -> LoadedSpec:
     headers: dict[str, str] = {}
     if environment is not None:
@@ -266,12 +408,9 @@ async def load_spec(
         or url.endswith(".yml")
     )
     try:
-        spec = yaml.safe_load(resp.text) if is_yaml else json.loads(resp.text)
-        if not isinstance(spec, dict):
-            try:
-                spec = yaml.safe_load(resp.text)
-            except Exception:
-                pass
+        # Parsing and flattening a large spec is pure CPU work that would
+        # stall every other request on the event loop; run both in a thread.
+        spec = await asyncio.to_thread(_parse_document, resp.content, is_yaml)
     except Exception as exc:
         raise SpecParseError(f"Failed to parse spec: {exc}") from exc
 
@@ -283,7 +422,7 @@ async def load_spec(
         )
 
     # Resolve external path-item $refs (e.g. Morpheus modular spec)
-    await _resolve_external_path_items(spec, url, http_client)
+    await _resolve_external_path_items(spec, url, http_client, ref_cache)
 
     info = spec.get("info", {})
     title = info.get("title", "Untitled")
@@ -297,7 +436,7 @@ async def load_spec(
         scheme = spec.get("schemes", ["https"])[0]
         base_url = f"{scheme}://{spec['host']}{spec.get('basePath', '')}"
 
-    endpoints = _flatten_endpoints(spec)
+    endpoints = await asyncio.to_thread(_flatten_endpoints, spec)
 
     return LoadedSpec(
         title=title,
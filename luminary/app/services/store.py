@@ -1,47 +1,196 @@
 import asyncio
-import json
 import os
+from contextlib import suppress
 from datetime import datetime, timezone
 from pathlib import Path
 
-from app.models import Environment, EnvironmentCreate, EnvironmentUpdate, LoadedSpec
+import orjson
+from pydantic import TypeAdapter
+
+from app.models import (
+    Environment,
+    EnvironmentCreate,
+    EnvironmentPublic,
+    EnvironmentUpdate,
+    LoadedSpec,
+)
+
+# How long the background flusher waits after the first mutation so that a
+# burst of changes is written to disk once.
+FLUSH_DELAY = 0.05
+
+_UTC = timezone.utc
+
+_ENVIRONMENTS = TypeAdapter(list[Environment])
 
 
 class EnvironmentStore:
     def __init__(self, path: Path) -> None:
         self._path = path
         self._data: dict[str, Environment] = {}
+        # Immutable view of _data's values, rebuilt on every mutation.
+        self._snapshot: tuple[Environment, ...] = ()
+        # Encoded JSON of each environment, so a flush re-encodes nothing and
+        # a mutation only encodes the record it touched.
+        self._dumps: dict[str, bytes] = {}
+        # _data, _dumps and _snapshot are only mutated while holding _lock. Readers skip
+        # it: mutations never await midway, so a reader sees either the whole
+        # pre-mutation or the whole post-mutation state.
         self._lock = asyncio.Lock()
+        # Serializes file writes so they land in snapshot order; _lock only
+        # guards the in-memory state and is never held across encoding or disk I/O.
+        self._write_lock = asyncio.Lock()
+        # Encoded EnvironmentPublic of each environment, filled lazily by
+        # list_bytes(). Kept apart from _dumps, which carries the secrets.
+        self._public_dumps: dict[str, bytes] = {}
+        # Encoded GET /api/environments body; dropped on every mutation.
+        self._list_bytes: bytes | None = None
+        # Mutations only mark the store dirty; _flush_loop writes it out.
+        self._dirty = False
+        self._wakeup = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
         self.spec: LoadedSpec | None = None
+        self.spec_json: bytes | None = None
+
+    async def set_spec(self, spec: LoadedSpec | None) -> None:
+        # Encode once per load so GET /api/spec serves bytes instead of
+        # re-walking the raw OpenAPI document on every request. Large specs
+        # take tens of ms to encode, so do it off the event loop.
+        spec_json = None
+        if spec is not None:
+            spec_json = await asyncio.to_thread(self._encode_spec, spec)
+        self.spec = spec
+        self.spec_json = spec_json
+
+    @staticmethod
+    def _encode_spec(spec: LoadedSpec) -> bytes:
+        return spec.model_dump_json(by_alias=True).encode()
 
     async def load(self) -> None:
         if self._path.exists():
             try:
-                text = self._path.read_text()
-                raw = json.loads(text)
-                for item in raw:
-                    env = Environment.model_validate(item)
+                blob = self._path.read_bytes()
+                try:
+                    # pydantic-core parses and validates the whole array in one
+                    # pass, without building intermediate dicts.
+                    envs = _ENVIRONMENTS.validate_json(blob)
+                except ValueError:
+                    # Damaged file: validate record by record so the ones ahead
+                    # of the bad entry are still loaded.
+                    envs = (Environment.model_validate(i) for i in orjson.loads(blob))
+                for env in envs:
                     self._data[env.id] = env
+                    self._dumps[env.id] = env.model_dump_json().encode()
             except Exception:
                 pass
+            self._snapshot = tuple(self._data.values())
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def reset(self, path: Path) -> None:
+        """Flush pending changes, then reload the store from another file."""
+        await self._flush()
+        async with self._lock:
+            self._path = path
+            self._data.clear()
+            self._dumps.clear()
+            self._public_dumps.clear()
+            self._snapshot = ()
+            self._list_bytes = None
+        await self.set_spec(None)
+        await self.load()
+
+    async def aclose(self) -> None:
+        """Stop the background flusher and write out any pending changes."""
+        if self._flusher is not None:
+            self._closing.set()
+            self._wakeup.set()
+            await self._flusher
+            self._flusher = None
+        await self._flush()
 
-    async def _persist(self) -> None:
+    def _mark_dirty(self) -> None:
+        self._snapshot = tuple(self._data.values())
+        self._list_bytes = None
+        self._dirty = True
+        self._wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        while not self._closing.is_set():
+            await self._wakeup.wait()
+            # Let a burst of mutations land first; shutdown cuts this short.
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._closing.wait(), FLUSH_DELAY)
+            self._wakeup.clear()
+            # A failed write stays dirty and is retried on the next mutation;
+            # aclose() surfaces the error if it still fails at shutdown.
+            with suppress(OSError):
+                await self._flush()
+
+    async def _flush(self) -> None:
+        async with self._write_lock:
+            async with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                parts = list(self._dumps.values())
+            try:
+                blob = b"[" + b",".join(parts) + b"]"
+                # The write and rename are blocking syscalls; keep them off
+                # the event loop.
+                await asyncio.to_thread(self._write_atomic, blob)
+            except BaseException:
+                self._dirty = True
+                raise
+
+    def _write_atomic(self, blob: bytes) -> None:
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self._path.with_suffix(".tmp")
-        payload = [e.model_dump(mode="json") for e in self._data.values()]
-        tmp.write_text(json.dumps(payload, default=str))
-        os.replace(tmp, self._path)
+        try:
+            # Cold path: with no previous file there is nothing a torn write
+            # could destroy, so create it in place and skip the rename.
+            self._write_durable(self._path, blob, mode="xb")
+        except FileExistsError:
+            tmp = self._path.with_suffix(".tmp")
+            self._write_durable(tmp, blob, mode="wb")
+            os.replace(tmp, self._path)
+        # Persist the directory entry too, or the rename can be lost on crash.
+        dir_fd = os.open(self._path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
 
-    async def get_all(self) -> list[Environment]:
-        async with self._lock:
-            return list(self._data.values())
+    @staticmethod
+    def _write_durable(path: Path, blob: bytes, mode: str) -> None:
+        with open(path, mode) as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def get_all(self) -> tuple[Environment, ...]:
+        # Rebuilt rather than mutated, so callers can hold on to it as-is.
+        return self._snapshot
+
+    async def list_bytes(self) -> bytes:
+        # After a mutation only the touched environment is re-encoded; the
+        # rest of the body is a join of cached bytes.
+        if self._list_bytes is None:
+            parts = []
+            for env in self._snapshot:
+                part = self._public_dumps.get(env.id)
+                if part is None:
+                    part = EnvironmentPublic.from_env(env).model_dump_json().encode()
+                    self._public_dumps[env.id] = part
+                parts.append(part)
+            self._list_bytes = b"[" + b",".join(parts) + b"]"
+        return self._list_bytes
 
     async def get(self, env_id: str) -> Environment | None:
-        async with self._lock:
-            return self._data.get(env_id)
+        return self._data.get(env_id)
 
     async def create(self, data: EnvironmentCreate) -> Environment:
-        now = datetime.now(timezone.utc)
+        now = datetime.now(_UTC)
         env = Environment(
             name=data.name,
             base_url=data.base_url,
@@ -52,20 +201,32 @@ class EnvironmentStore:
         )
         async with self._lock:
             self._data[env.id] = env
-            await self._persist()
+            self._dumps[env.id] = env.model_dump_json().encode()
+            self._mark_dirty()
         return env
 
     async def update(self, env_id: str, data: EnvironmentUpdate) -> Environment | None:
+        now = datetime.now(_UTC)
         async with self._lock:
             env = self._data.get(env_id)
             if env is None:
                 return None
-            update_data = data.model_dump(exclude_none=True)
-            updated = env.model_copy(
-                update={**update_data, "updated_at": datetime.now(timezone.utc)}
-            )
+            # Only the fields the client actually sent, kept as model objects
+            # (dumping would turn a nested AuthConfig into a plain dict).
+            # Explicit nulls mean "unchanged": no Environment field is nullable.
+            update_data = {
+                name: value
+                for name in data.model_fields_set
+                if (value := getattr(data, name)) is not None
+            }
+            # Idempotent PUTs neither touch updated_at nor rewrite the file.
+            if all(getattr(env, k) == v for k, v in update_data.items()):
+                return env
+            updated = env.model_copy(update={**update_data, "updated_at": now})
             self._data[env_id] = updated
-            await self._persist()
+            self._dumps[env_id] = updated.model_dump_json().encode()
+            self._public_dumps.pop(env_id, None)
+            self._mark_dirty()
             return updated
 
     async def delete(self, env_id: str) -> bool:
@@ -73,5 +234,7 @@ class EnvironmentStore:
             if env_id not in self._data:
                 return False
             del self._data[env_id]
-            await self._persist()
+            del self._dumps[env_id]
+            self._public_dumps.pop(env_id, None)
+            self._mark_dirty()
             return True
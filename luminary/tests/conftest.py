@@ -1,24 +1,24 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.main import create_app
 
 
-@pytest.fixture
-def tmp_data_dir(tmp_path, monkeypatch):
-    """Point DATA_DIR at a temp directory so tests never touch /app/data."""
-    import app.config as cfg
-    monkeypatch.setattr(cfg, "DATA_DIR", tmp_path)
-    return tmp_path
+@pytest.fixture(scope="session")
+def _session_client(tmp_path_factory):
+    """One TestClient (and app lifespan) shared by the whole session."""
+    app = create_app(tmp_path_factory.mktemp("data"))
+    with TestClient(app, raise_server_exceptions=True) as c:
+        yield c
 
 
 @pytest.fixture
-def client(tmp_data_dir):
-    """TestClient with a fresh in-memory store backed by tmp_path."""
-    # Re-import app after patching DATA_DIR
-    from app.main import app
-
-    with TestClient(app, raise_server_exceptions=True) as c:
-        yield c
+def client(_session_client, tmp_path):
+    """The shared TestClient, with its store emptied and moved to tmp_path."""
+    state = _session_client.app.state
+    _session_client.portal.call(state.store.reset, tmp_path / "environments.json")
+    state.ref_cache.clear()
+    return _session_client
 
 
 @pytest.fixture
@@ -0,0 +1,2 @@
+# Shared by tests that send or mock pre-encoded JSON bodies.
+JSON_HEADERS = {"content-type": "application/json"}
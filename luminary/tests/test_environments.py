@@ -1,4 +1,6 @@
+import orjson
 
+from tests.helpers import JSON_HEADERS
 
 ENV_PAYLOAD = {
     "name": "Morpheus Prod",
@@ -10,10 +12,17 @@ ENV_PAYLOAD = {
     },
     "verify_ssl": False,
 }
+ENV_PAYLOAD_BYTES = orjson.dumps(ENV_PAYLOAD)
+
+
+def _post_env(client):
+    return client.post(
+        "/api/environments", content=ENV_PAYLOAD_BYTES, headers=JSON_HEADERS
+    )
 
 
 def test_create_environment(client):
-    resp = client.post("/api/environments", json=ENV_PAYLOAD)
+    resp = _post_env(client)
     assert resp.status_code == 201
     data = resp.json()
     assert data["name"] == "Morpheus Prod"
@@ -24,7 +33,7 @@ def test_create_environment(client):
 
 
 def test_secret_not_exposed(client):
-    resp = client.post("/api/environments", json=ENV_PAYLOAD)
+    resp = _post_env(client)
     data = resp.json()
     auth = data["auth"]
     # Token must not be returned
@@ -36,8 +45,19 @@ def test_secret_not_exposed(client):
     assert auth["bearer_prefix"] == "BEARER"
 
 
+def test_secret_not_exposed_by_list_or_get(client):
+    created = _post_env(client).json()
+    listed = client.get("/api/environments")
+    fetched = client.get(f"/api/environments/{created['id']}")
+    for resp in (listed, fetched):
+        assert b"super-secret-token" not in resp.content
+    auth = listed.json()[0]["auth"]
+    assert auth["has_token"] is True
+    assert auth["has_password"] is False
+
+
 def test_list_environments(client):
-    client.post("/api/environments", json=ENV_PAYLOAD)
+    _post_env(client)
     client.post("/api/environments", json={**ENV_PAYLOAD, "name": "Dev"})
     resp = client.get("/api/environments")
     assert resp.status_code == 200
@@ -46,7 +66,7 @@ def test_list_environments(client):
 
 
 def test_get_environment(client):
-    created = client.post("/api/environments", json=ENV_PAYLOAD).json()
+    created = _post_env(client).json()
     env_id = created["id"]
     resp = client.get(f"/api/environments/{env_id}")
     assert resp.status_code == 200
@@ -59,7 +79,7 @@ def test_get_environment_not_found(client):
 
 
 def test_update_environment(client):
-    created = client.post("/api/environments", json=ENV_PAYLOAD).json()
+    created = _post_env(client).json()
     env_id = created["id"]
     resp = client.put(f"/api/environments/{env_id}", json={"name": "Updated Name"})
     assert resp.status_code == 200
@@ -73,7 +93,7 @@ def test_update_environment_not_found(client):
 
 
 def test_delete_environment(client):
-    created = client.post("/api/environments", json=ENV_PAYLOAD).json()
+    created = _post_env(client).json()
     env_id = created["id"]
     resp = client.delete(f"/api/environments/{env_id}")
     assert resp.status_code == 200
@@ -86,3 +106,51 @@ def test_delete_environment(client):
 def test_delete_environment_not_found(client):
     resp = client.delete("/api/environments/ghost")
     assert resp.status_code == 404
+
+
+def test_list_environments_reflects_mutations(client):
+    created = _post_env(client).json()
+    env_id = created["id"]
+    assert [e["name"] for e in client.get("/api/environments").json()] == [
+        "Morpheus Prod"
+    ]
+    client.put(f"/api/environments/{env_id}", json={"name": "Renamed"})
+    assert [e["name"] for e in client.get("/api/environments").json()] == ["Renamed"]
+    client.delete(f"/api/environments/{env_id}")
+    assert client.get("/api/environments").json() == []
+
+
+def test_update_environment_noop_keeps_updated_at(client):
+    created = _post_env(client).json()
+    env_id = created["id"]
+    for body in ({}, {"name": ENV_PAYLOAD["name"], "verify_ssl": False}):
+        resp = client.put(f"/api/environments/{env_id}", json=body)
+        assert resp.status_code == 200
+        assert resp.json()["updated_at"] == created["updated_at"]
+
+
+def test_update_environment_auth(client):
+    created = _post_env(client).json()
+    env_id = created["id"]
+    resp = client.put(
+        f"/api/environments/{env_id}",
+        json={"auth": {"type": "basic", "username": "admin", "password": "pw"}},
+    )
+    assert resp.status_code == 200
+    auth = resp.json()["auth"]
+    assert auth["type"] == "basic"
+    assert auth["username"] == "admin"
+    assert auth["has_password"] is True
+    assert auth["has_token"] is False
+    assert client.get(f"/api/environments/{env_id}").json()["auth"] == auth
+
+
+def test_update_environment_ignores_explicit_nulls(client):
+    created = _post_env(client).json()
+    env_id = created["id"]
+    resp = client.put(
+        f"/api/environments/{env_id}", json={"name": None, "base_url": "https://b"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["name"] == ENV_PAYLOAD["name"]
+    assert resp.json()["base_url"] == "https://b"
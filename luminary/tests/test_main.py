@@ -1,6 +1,10 @@
+import asyncio
+
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.main import _build_http_client, app
 
 client = TestClient(app)
 
@@ -23,3 +27,24 @@ def test_api_info():
     data = response.json()
     assert data["message"] == "Hello World"
     assert data["version"] == "0.2.0"
+
+
+async def test_http_client_honours_environment_proxy(monkeypatch):
+    # A stand-in proxy that records the first request line and hangs up.
+    seen: list[bytes] = []
+
+    async def handle(reader, writer):
+        seen.append(await reader.readline())
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("HTTPS_PROXY", f"http://127.0.0.1:{port}")
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    monkeypatch.delenv("no_proxy", raising=False)
+    async with server:
+        for verify in (True, False):
+            async with _build_http_client(verify=verify) as http_client:
+                with pytest.raises(httpx.HTTPError):
+                    await http_client.get("https://api.example.com/health")
+    assert seen == [b"CONNECT api.example.com:443 HTTP/1.1\r\n"] * 2
@@ -1,6 +1,9 @@
 import httpx
+import orjson
+import pytest
 import respx
 
+from tests.helpers import JSON_HEADERS
 
 MORPHEUS_ENV = {
     "name": "Morpheus Test",
@@ -24,10 +27,13 @@ API_KEY_ENV = {
     "verify_ssl": True,
 }
 
+MORPHEUS_ENV_BYTES = orjson.dumps(MORPHEUS_ENV)
+API_KEY_ENV_BYTES = orjson.dumps(API_KEY_ENV)
+
 
 def _create_env(client, payload=None) -> str:
-    payload = payload or MORPHEUS_ENV
-    resp = client.post("/api/environments", json=payload)
+    payload = payload or MORPHEUS_ENV_BYTES
+    resp = client.post("/api/environments", content=payload, headers=JSON_HEADERS)
     assert resp.status_code == 201
     return resp.json()["id"]
 
@@ -69,7 +75,7 @@ def test_proxy_bearer_injection(client):
 
 @respx.mock
 def test_proxy_api_key_injection(client):
-    env_id = _create_env(client, API_KEY_ENV)
+    env_id = _create_env(client, API_KEY_ENV_BYTES)
     captured_headers = {}
 
     def capture(request):
@@ -160,3 +166,194 @@ def test_proxy_unknown_env_returns_404(client):
         json={"environment_id": "doesnotexist", "method": "GET", "path": "/api/test"},
     )
     assert resp.status_code == 404
+
+
+@respx.mock
+def test_proxy_stream_relays_raw_upstream_response(client):
+    env_id = _create_env(client)
+    payload = b'{"data": [' + b",".join(b"%d" % i for i in range(50_000)) + b"]}"
+    respx.get("https://mock-morpheus.local/api/export").mock(
+        return_value=httpx.Response(
+            201,
+            content=payload,
+            headers={"content-type": "application/json", "keep-alive": "timeout=5"},
+        )
+    )
+    resp = client.post(
+        "/api/proxy/execute",
+        json={
+            "environment_id": env_id,
+            "method": "GET",
+            "path": "/api/export",
+            "stream": True,
+        },
+    )
+    assert resp.status_code == 201
+    assert resp.content == payload
+    assert resp.headers["content-type"] == "application/json"
+    assert "keep-alive" not in resp.headers
+
+
+@respx.mock
+def test_proxy_stream_timeout_returns_504(client):
+    env_id = _create_env(client, API_KEY_ENV_BYTES)
+    respx.get("https://mock-api.local/slow").mock(
+        side_effect=httpx.TimeoutException("timeout")
+    )
+    resp = client.post(
+        "/api/proxy/execute",
+        json={
+            "environment_id": env_id,
+            "method": "GET",
+            "path": "/slow",
+            "stream": True,
+        },
+    )
+    assert resp.status_code == 504
+
+
+@respx.mock
+def test_proxy_substitutes_path_params(client):
+    env_id = _create_env(client)
+    captured = {}
+
+    def capture(request):
+        captured["path"] = request.url.raw_path
+        return httpx.Response(200)
+
+    respx.route(host="mock-morpheus.local").mock(side_effect=capture)
+    resp = client.post(
+        "/api/proxy/execute",
+        json={
+            "environment_id": env_id,
+            "method": "GET",
+            "path": "/api/groups/{group}/instances/{id}/logs/{missing}",
+            "path_params": {"group": "7", "id": "1/2"},
+        },
+    )
+    assert resp.status_code == 200
+    # Values are quoted whole; placeholders without a value are left alone.
+    assert captured["path"] == b"/api/groups/7/instances/1%2F2/logs/%7Bmissing%7D"
+
+
+class _FailingStream(httpx.AsyncByteStream):
+    """Upstream body that breaks after its first chunk."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def __aiter__(self):
+        yield b'{"partial": '
+        raise httpx.ReadError("connection reset")
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@respx.mock
+def test_proxy_stream_closes_upstream_when_body_fails(client):
+    env_id = _create_env(client)
+    upstream = _FailingStream()
+    respx.get("https://mock-morpheus.local/api/export").mock(
+        return_value=httpx.Response(200, stream=upstream)
+    )
+    with pytest.raises(httpx.ReadError):
+        client.post(
+            "/api/proxy/execute",
+            json={
+                "environment_id": env_id,
+                "method": "GET",
+                "path": "/api/export",
+                "stream": True,
+            },
+        )
+    assert upstream.closed
+
+
+@respx.mock
+def test_proxy_filters_hop_by_hop_and_joins_repeated_headers(client):
+    env_id = _create_env(client, API_KEY_ENV_BYTES)
+    respx.get("https://mock-api.local/login").mock(
+        return_value=httpx.Response(
+            200,
+            json={},
+            headers=[
+                ("Set-Cookie", "a=1"),
+                ("Set-Cookie", "b=2"),
+                ("Keep-Alive", "timeout=5"),
+                ("X-Request-Id", "abc"),
+            ],
+        )
+    )
+    resp = client.post(
+        "/api/proxy/execute",
+        json={"environment_id": env_id, "method": "GET", "path": "/login"},
+    )
+    headers = resp.json()["headers"]
+    assert headers["set-cookie"] == "a=1, b=2"
+    assert headers["x-request-id"] == "abc"
+    assert "keep-alive" not in headers
+
+
+@respx.mock
+def test_proxy_body_decoding_follows_content_type(client):
+    env_id = _create_env(client, API_KEY_ENV_BYTES)
+    respx.get("https://mock-api.local/vendor").mock(
+        return_value=httpx.Response(
+            200,
+            content=b'{"ok": true}',
+            headers={"Content-Type": "application/vnd.api+json; charset=utf-8"},
+        )
+    )
+    respx.get("https://mock-api.local/plain").mock(
+        return_value=httpx.Response(200, text='{"ok": true}')
+    )
+    vendor = client.post(
+        "/api/proxy/execute",
+        json={"environment_id": env_id, "method": "GET", "path": "/vendor"},
+    )
+    plain = client.post(
+        "/api/proxy/execute",
+        json={"environment_id": env_id, "method": "GET", "path": "/plain"},
+    )
+    assert vendor.json()["body"] == {"ok": True}
+    assert plain.json()["body"] == '{"ok": true}'
+
+
+@respx.mock
+def test_proxy_picks_client_by_verify_ssl(client, mocker):
+    state = client.app.state
+    secure = {
+        "request": mocker.spy(state.http_client, "request"),
+        "stream": mocker.spy(state.http_client, "stream"),
+    }
+    insecure = {
+        "request": mocker.spy(state.http_client_insecure, "request"),
+        "stream": mocker.spy(state.http_client_insecure, "stream"),
+    }
+    respx.get("https://mock-api.local/ping").mock(return_value=httpx.Response(200))
+    respx.get("https://mock-morpheus.local/ping").mock(
+        return_value=httpx.Response(200)
+    )
+    verified_id = _create_env(client, API_KEY_ENV_BYTES)
+    unverified_id = _create_env(client, MORPHEUS_ENV_BYTES)
+
+    for stream in (False, True):
+        kind = "stream" if stream else "request"
+        for env_id, used, unused in (
+            (verified_id, secure, insecure),
+            (unverified_id, insecure, secure),
+        ):
+            resp = client.post(
+                "/api/proxy/execute",
+                json={
+                    "environment_id": env_id,
+                    "method": "GET",
+                    "path": "/ping",
+                    "stream": stream,
+                },
+            )
+            assert resp.status_code == 200
+            assert used[kind].call_count == 1
+            assert unused[kind].call_count == 0
+            used[kind].reset_mock()
@@ -1,6 +1,9 @@
-
-import respx
 import httpx
+import orjson
+import respx
+
+from app.services.spec_service import SpecParseError
+from tests.helpers import JSON_HEADERS
 
 SIMPLE_JSON_SPEC = {
     "openapi": "3.1.0",
@@ -53,11 +56,15 @@ paths:
           description: OK
 """
 
+# Encoded once so the mocked upstream doesn't re-serialize them per test.
+SIMPLE_JSON_SPEC_BYTES = orjson.dumps(SIMPLE_JSON_SPEC)
+SIMPLE_YAML_SPEC_BYTES = SIMPLE_YAML_SPEC.encode()
+
 
 @respx.mock
 def test_load_json_spec(client):
     respx.get("https://spec.example.com/openapi.json").mock(
-        return_value=httpx.Response(200, json=SIMPLE_JSON_SPEC)
+        return_value=httpx.Response(200, content=SIMPLE_JSON_SPEC_BYTES, headers=JSON_HEADERS)
     )
     resp = client.post("/api/spec/load", json={"url": "https://spec.example.com/openapi.json"})
     assert resp.status_code == 200
@@ -73,7 +80,9 @@ def test_load_json_spec(client):
 @respx.mock
 def test_load_yaml_spec(client):
     respx.get("https://spec.example.com/openapi.yaml").mock(
-        return_value=httpx.Response(200, text=SIMPLE_YAML_SPEC, headers={"content-type": "application/yaml"})
+        return_value=httpx.Response(
+            200, content=SIMPLE_YAML_SPEC_BYTES, headers={"content-type": "application/yaml"}
+        )
     )
     resp = client.post("/api/spec/load", json={"url": "https://spec.example.com/openapi.yaml"})
     assert resp.status_code == 200
@@ -110,7 +119,7 @@ def test_get_spec_not_loaded(client):
 @respx.mock
 def test_get_spec_after_load(client):
     respx.get("https://spec.example.com/openapi.json").mock(
-        return_value=httpx.Response(200, json=SIMPLE_JSON_SPEC)
+        return_value=httpx.Response(200, content=SIMPLE_JSON_SPEC_BYTES, headers=JSON_HEADERS)
     )
     client.post("/api/spec/load", json={"url": "https://spec.example.com/openapi.json"})
     resp = client.get("/api/spec")
@@ -122,7 +131,7 @@ def test_get_spec_after_load(client):
 @respx.mock
 def test_clear_spec(client):
     respx.get("https://spec.example.com/openapi.json").mock(
-        return_value=httpx.Response(200, json=SIMPLE_JSON_SPEC)
+        return_value=httpx.Response(200, content=SIMPLE_JSON_SPEC_BYTES, headers=JSON_HEADERS)
     )
     client.post("/api/spec/load", json={"url": "https://spec.example.com/openapi.json"})
     resp = client.delete("/api/spec")
@@ -131,3 +140,253 @@ def test_clear_spec(client):
     # Should be unloaded
     resp2 = client.get("/api/spec")
     assert resp2.json() == {"loaded": False}
+
+
+@respx.mock
+def test_get_spec_uses_parameter_schema_alias(client):
+    respx.get("https://spec.example.com/openapi.json").mock(
+        return_value=httpx.Response(200, content=SIMPLE_JSON_SPEC_BYTES, headers=JSON_HEADERS)
+    )
+    client.post("/api/spec/load", json={"url": "https://spec.example.com/openapi.json"})
+    data = client.get("/api/spec").json()
+    get_pets = next(e for e in data["endpoints"] if e["method"] == "GET")
+    assert get_pets["parameters"][0]["schema"] == {"type": "integer"}
+    assert "schema_" not in get_pets["parameters"][0]
+
+
+@respx.mock
+def test_get_spec_serves_cached_document_with_large_integers(client):
+    spec = {
+        **SIMPLE_JSON_SPEC,
+        "components": {"schemas": {"Id": {"type": "integer", "maximum": 2**64 - 1}}},
+    }
+    respx.get("https://spec.example.com/openapi.json").mock(
+        return_value=httpx.Response(200, json=spec)
+    )
+    loaded = client.post("/api/spec/load", json={"url": "https://spec.example.com/openapi.json"})
+    assert loaded.status_code == 200
+    resp = client.get("/api/spec")
+    assert resp.status_code == 200
+    assert resp.content == loaded.content
+    assert resp.json()["raw"]["components"]["schemas"]["Id"]["maximum"] == 2**64 - 1
+
+
+@respx.mock
+def test_load_spec_keeps_integers_wider_than_64_bits(client):
+    spec = {
+        **SIMPLE_JSON_SPEC,
+        "components": {"schemas": {"U128": {"type": "integer", "maximum": 2**128 - 1}}},
+    }
+    respx.get("https://spec.example.com/openapi.json").mock(
+        return_value=httpx.Response(200, json=spec)
+    )
+    client.post("/api/spec/load", json={"url": "https://spec.example.com/openapi.json"})
+    resp = client.get("/api/spec")
+    assert resp.status_code == 200
+    assert b"340282366920938463463374607431768211455" in resp.content
+    assert resp.json()["raw"]["components"]["schemas"]["U128"]["maximum"] == 2**128 - 1
+
+
+@respx.mock
+def test_load_flow_style_yaml_spec(client):
+    flow_yaml = (
+        "{openapi: 3.0.0, info: {title: Flow API, version: '1'}, "
+        "paths: {/a: {get: {summary: A}}}}"
+    )
+    respx.get("https://spec.example.com/flow.yaml").mock(
+        return_value=httpx.Response(200, text=flow_yaml)
+    )
+    resp = client.post("/api/spec/load", json={"url": "https://spec.example.com/flow.yaml"})
+    assert resp.status_code == 200
+    assert resp.json()["title"] == "Flow API"
+    assert len(resp.json()["endpoints"]) == 1
+
+
+LOOSELY_TYPED_YAML_SPEC = """\
+openapi: 3.0.0
+info: {title: Loose API, version: "1"}
+paths:
+  /items/{id}:
+    post:
+      operationId: 123
+      summary: 42
+      tags: single
+      parameters:
+        - {name: id, in: path, required: "true"}
+        - {name: verbose, in: query, required: "false", schema: nope}
+      requestBody:
+        required: "false"
+        content:
+          application/json: {schema: {type: object}}
+"""
+
+
+@respx.mock
+def test_load_spec_coerces_loosely_typed_fields(client):
+    respx.get("https://spec.example.com/loose.yaml").mock(
+        return_value=httpx.Response(200, text=LOOSELY_TYPED_YAML_SPEC)
+    )
+    resp = client.post("/api/spec/load", json={"url": "https://spec.example.com/loose.yaml"})
+    assert resp.status_code == 200
+    [endpoint] = resp.json()["endpoints"]
+    assert endpoint["operation_id"] == "123"
+    assert endpoint["summary"] == "42"
+    assert endpoint["tags"] == []
+    assert endpoint["request_body_required"] is False
+    params = {p["name"]: p for p in endpoint["parameters"]}
+    assert params["id"]["required"] is True
+    assert params["verbose"]["required"] is False
+    assert params["verbose"]["schema"] == {}
+
+
+@respx.mock
+def test_load_spec_resolves_internal_refs(client):
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Ref API", "version": "1"},
+        "paths": {
+            "/pets": {
+                "post": {
+                    "parameters": [{"$ref": "#/components/parameters/Limit"}],
+                    "requestBody": {"$ref": "#/components/requestBodies/NewPet"},
+                },
+            }
+        },
+        "components": {
+            "parameters": {
+                "Limit": {
+                    "name": "limit",
+                    "in": "query",
+                    "schema": {"$ref": "#/components/schemas/Count"},
+                }
+            },
+            "requestBodies": {
+                "NewPet": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Pet"}
+                        }
+                    },
+                }
+            },
+            "schemas": {
+                "Count": {"type": "integer"},
+                "Pet": {"type": "object", "properties": {"name": {"type": "string"}}},
+            },
+        },
+    }
+    respx.get("https://spec.example.com/refs.json").mock(
+        return_value=httpx.Response(200, json=spec)
+    )
+    resp = client.post("/api/spec/load", json={"url": "https://spec.example.com/refs.json"})
+    assert resp.status_code == 200
+    endpoint = resp.json()["endpoints"][0]
+    assert endpoint["parameters"][0]["name"] == "limit"
+    assert endpoint["parameters"][0]["schema"] == {"type": "integer"}
+    assert endpoint["request_body_required"] is True
+    assert endpoint["request_body_schema"]["properties"] == {"name": {"type": "string"}}
+
+
+MODULAR_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Modular API", "version": "1"},
+    "paths": {
+        "/instances": {"$ref": "paths/instances.yaml"},
+        "/clouds": {"$ref": "paths/clouds.json"},
+    },
+}
+
+INSTANCES_PATH_ITEM = """\
+get:
+  summary: List instances
+  parameters:
+    - $ref: ../parameters/max.yaml
+    - name: name
+      in: query
+"""
+
+CLOUDS_PATH_ITEM = {
+    "get": {
+        "summary": "List clouds",
+        "parameters": [{"$ref": "../parameters/max.yaml"}],
+    }
+}
+
+MAX_PARAMETER = """\
+name: max
+in: query
+schema:
+  type: integer
+"""
+
+
+@respx.mock
+def test_load_spec_resolves_external_path_items(client):
+    base = "https://spec.example.com/api"
+    respx.get(f"{base}/openapi.json").mock(
+        return_value=httpx.Response(200, json=MODULAR_SPEC)
+    )
+    respx.get(f"{base}/paths/instances.yaml").mock(
+        return_value=httpx.Response(200, text=INSTANCES_PATH_ITEM)
+    )
+    respx.get(f"{base}/paths/clouds.json").mock(
+        return_value=httpx.Response(200, json=CLOUDS_PATH_ITEM)
+    )
+    max_route = respx.get(f"{base}/parameters/max.yaml").mock(
+        return_value=httpx.Response(200, text=MAX_PARAMETER)
+    )
+    resp = client.post("/api/spec/load", json={"url": f"{base}/openapi.json"})
+    assert resp.status_code == 200
+    endpoints = {e["path"]: e for e in resp.json()["endpoints"]}
+    assert set(endpoints) == {"/instances", "/clouds"}
+    instance_params = endpoints["/instances"]["parameters"]
+    assert [p["name"] for p in instance_params] == ["max", "name"]
+    assert instance_params[0]["schema"] == {"type": "integer"}
+    assert endpoints["/clouds"]["parameters"][0]["name"] == "max"
+    # Shared parameter files are downloaded once per load
+    assert max_route.call_count == 1
+
+
+@respx.mock
+def test_external_ref_failure_keeps_spec_error_mapping(client, mocker):
+    base = "https://spec.example.com/api"
+    respx.get(f"{base}/openapi.json").mock(
+        return_value=httpx.Response(200, json=MODULAR_SPEC)
+    )
+    mocker.patch(
+        "app.services.spec_service._fetch_external",
+        side_effect=SpecParseError("bad path item"),
+    )
+    resp = client.post("/api/spec/load", json={"url": f"{base}/openapi.json"})
+    assert resp.status_code == 422
+    assert "bad path item" in resp.json()["detail"]
+
+
+@respx.mock
+def test_reload_revalidates_external_refs_with_etag(client):
+    base = "https://spec.example.com/api"
+    respx.get(f"{base}/openapi.json").mock(
+        return_value=httpx.Response(200, json=MODULAR_SPEC)
+    )
+    respx.get(f"{base}/paths/clouds.json").mock(
+        return_value=httpx.Response(200, json=CLOUDS_PATH_ITEM)
+    )
+    respx.get(f"{base}/parameters/max.yaml").mock(
+        return_value=httpx.Response(200, text=MAX_PARAMETER)
+    )
+    conditional = []
+
+    def instances(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            conditional.append(request.url.path)
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, text=INSTANCES_PATH_ITEM, headers={"etag": '"v1"'})
+
+    respx.get(f"{base}/paths/instances.yaml").mock(side_effect=instances)
+
+    first = client.post("/api/spec/load", json={"url": f"{base}/openapi.json"})
+    second = client.post("/api/spec/load", json={"url": f"{base}/openapi.json"})
+    assert first.status_code == second.status_code == 200
+    assert conditional == ["/api/paths/instances.yaml"]
+    assert first.json()["endpoints"] == second.json()["endpoints"]
@@ -0,0 +1,175 @@
+import asyncio
+import os
+
+import orjson
+
+from app.models import (
+    AuthConfig,
+    Environment,
+    EnvironmentCreate,
+    EnvironmentPublic,
+    EnvironmentUpdate,
+    LoadedSpec,
+)
+from app.services.store import FLUSH_DELAY, EnvironmentStore
+
+
+def _payload(name: str = "Prod") -> EnvironmentCreate:
+    return EnvironmentCreate(
+        name=name,
+        base_url="https://prod.example.com",
+        auth=AuthConfig(type="bearer", token="secret"),
+    )
+
+
+async def test_store_persists_across_reload(tmp_path):
+    path = tmp_path / "environments.json"
+    store = EnvironmentStore(path)
+    await store.load()
+    created = await store.create(_payload())
+    await store.update(created.id, EnvironmentUpdate(name="Renamed"))
+    other = await store.create(_payload("Dev"))
+    await store.delete(other.id)
+    await store.aclose()
+
+    reloaded = EnvironmentStore(path)
+    await reloaded.load()
+    envs = await reloaded.get_all()
+    assert len(envs) == 1
+    assert envs[0].id == created.id
+    assert envs[0].name == "Renamed"
+    assert envs[0].auth.token == "secret"
+    assert envs[0].created_at == created.created_at
+
+
+async def test_store_load_missing_file_is_empty(tmp_path):
+    store = EnvironmentStore(tmp_path / "missing" / "environments.json")
+    await store.load()
+    assert len(await store.get_all()) == 0
+
+
+async def test_store_coalesces_mutations_into_one_write(tmp_path, mocker):
+    store = EnvironmentStore(tmp_path / "environments.json")
+    await store.load()
+    persist = mocker.spy(store, "_write_atomic")
+    for i in range(5):
+        await store.create(_payload(f"env-{i}"))
+    assert persist.call_count == 0
+    await store.aclose()
+    assert persist.call_count == 1
+
+    reloaded = EnvironmentStore(tmp_path / "environments.json")
+    await reloaded.load()
+    assert len(await reloaded.get_all()) == 5
+    await reloaded.aclose()
+
+
+async def test_store_flushes_in_background(tmp_path):
+    path = tmp_path / "environments.json"
+    store = EnvironmentStore(path)
+    await store.load()
+    await store.create(_payload())
+    assert not path.exists()
+
+    async def flushed() -> None:
+        # Dirty until the flusher takes the write lock, which it then holds
+        # until the file is on disk.
+        while store._dirty or store._write_lock.locked():
+            await asyncio.sleep(FLUSH_DELAY / 5)
+
+    await asyncio.wait_for(flushed(), timeout=5)
+    assert [e["name"] for e in orjson.loads(path.read_bytes())] == ["Prod"]
+    await store.aclose()
+
+
+async def test_store_first_write_skips_rename(tmp_path, mocker):
+    path = tmp_path / "environments.json"
+    store = EnvironmentStore(path)
+    await store.load()
+    replace = mocker.spy(os, "replace")
+    await store.create(_payload())
+    await store._flush()
+    assert replace.call_count == 0
+    await store.create(_payload("Dev"))
+    await store.aclose()
+    assert replace.call_count == 1
+    assert not path.with_suffix(".tmp").exists()
+
+
+async def test_store_flush_does_not_reencode_unchanged(tmp_path, mocker):
+    store = EnvironmentStore(tmp_path / "environments.json")
+    await store.load()
+    envs = [await store.create(_payload(f"env-{i}")) for i in range(3)]
+    await store._flush()
+    dump = mocker.spy(Environment, "model_dump_json")
+    await store.update(envs[0].id, EnvironmentUpdate(name="Renamed"))
+    await store.aclose()
+    assert dump.call_count == 1
+
+    reloaded = EnvironmentStore(tmp_path / "environments.json")
+    await reloaded.load()
+    names = sorted(e.name for e in await reloaded.get_all())
+    assert names == ["Renamed", "env-1", "env-2"]
+
+
+async def test_store_load_keeps_records_ahead_of_a_bad_one(tmp_path):
+    path = tmp_path / "environments.json"
+    store = EnvironmentStore(path)
+    await store.load()
+    good = await store.create(_payload())
+    await store.aclose()
+    path.write_bytes(path.read_bytes()[:-1] + b',{"name": "broken"}]')
+
+    reloaded = EnvironmentStore(path)
+    await reloaded.load()
+    envs = await reloaded.get_all()
+    assert [e.id for e in envs] == [good.id]
+    await reloaded.aclose()
+
+
+async def test_store_reset_flushes_and_switches_file(tmp_path):
+    first = tmp_path / "first.json"
+    store = EnvironmentStore(first)
+    await store.load()
+    created = await store.create(_payload())
+    await store.reset(tmp_path / "second.json")
+    assert len(await store.get_all()) == 0
+    assert await store.get(created.id) is None
+
+    await store.reset(first)
+    assert [e.id for e in await store.get_all()] == [created.id]
+    await store.aclose()
+
+
+async def test_store_list_bytes_reencodes_only_touched(tmp_path, mocker):
+    store = EnvironmentStore(tmp_path / "environments.json")
+    await store.load()
+    envs = [await store.create(_payload(f"env-{i}")) for i in range(3)]
+    await store.list_bytes()
+    dump = mocker.spy(EnvironmentPublic, "model_dump_json")
+    await store.update(envs[1].id, EnvironmentUpdate(name="Renamed"))
+    await store.delete(envs[2].id)
+    body = await store.list_bytes()
+    assert dump.call_count == 1
+    assert b"secret" not in body
+    assert [e["name"] for e in orjson.loads(body)] == ["env-0", "Renamed"]
+    await store.aclose()
+
+
+async def test_store_encodes_spec_in_a_worker_thread(tmp_path, mocker):
+    store = EnvironmentStore(tmp_path / "environments.json")
+    spec = LoadedSpec(
+        title="API",
+        version="1.0",
+        endpoints=[],
+        raw={"openapi": "3.0.0"},
+        source_url="https://spec.example.com/openapi.json",
+        loaded_at="2024-01-01T00:00:00Z",
+    )
+    to_thread = mocker.spy(asyncio, "to_thread")
+    await store.set_spec(spec)
+    assert to_thread.call_count == 1
+    assert orjson.loads(store.spec_json)["title"] == "API"
+    await store.set_spec(None)
+    assert store.spec is None
+    assert store.spec_json is None